@@ -1,20 +1,38 @@
 import argparse
 from src.core import CRCrypt
+from src.core.engines import AUTO_ENGINE, available_engines
+from src.core.pipeline import DEFAULT_CHUNK_SIZE
 import sys
 
 def encrypt_message(args):
-    crcrypt = CRCrypt(key=args.key, cube_dim=args.cube_dim)
+    crcrypt = CRCrypt(key=args.key, cube_dim=args.cube_dim, engine=args.engine)
     encrypted = crcrypt.encrypt(args.message)
     print(f"Encrypted message: {encrypted}")
 
 def decrypt_message(args):
-    crcrypt = CRCrypt(key=args.key, cube_dim=args.cube_dim)
+    crcrypt = CRCrypt(key=args.key, cube_dim=args.cube_dim, engine=args.engine)
     try:
         decrypted = crcrypt.decrypt(args.ciphertext)
         print(f"Decrypted message: {decrypted}")
     except ValueError as e:
         print(f"Error: {e}", file=sys.stderr)
 
+def encrypt_file(args):
+    crcrypt = CRCrypt(key=args.key, cube_dim=args.cube_dim, engine=args.engine)
+    try:
+        written = crcrypt.encrypt_file(args.input, args.output, chunk_size=args.chunk_size)
+        print(f"Encrypted {written} bytes to {args.output}")
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+
+def decrypt_file(args):
+    crcrypt = CRCrypt(key=args.key, cube_dim=args.cube_dim, engine=args.engine)
+    try:
+        written = crcrypt.decrypt_file(args.input, args.output, chunk_size=args.chunk_size)
+        print(f"Decrypted {written} bytes to {args.output}")
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+
 def main():
     parser = argparse.ArgumentParser(description="CRCrypt: Clarke's Rubik's Cube Cryptography CLI")
     subparsers = parser.add_subparsers()
@@ -24,6 +42,8 @@ def main():
     parser_encrypt.add_argument('key', type=str, help="Encryption key")
     parser_encrypt.add_argument('message', type=str, help="Message to encrypt")
     parser_encrypt.add_argument('--cube_dim', type=int, default=4, help="Cube dimension (default: 4x4)")
+    parser_encrypt.add_argument('--engine', type=str, default=AUTO_ENGINE, choices=[AUTO_ENGINE] + available_engines(),
+                               help="Move engine backend (default: auto)")
     parser_encrypt.set_defaults(func=encrypt_message)
 
     # Decrypt subcommand
@@ -31,8 +51,24 @@ def main():
     parser_decrypt.add_argument('key', type=str, help="Decryption key")
     parser_decrypt.add_argument('ciphertext', type=str, help="Ciphertext to decrypt")
     parser_decrypt.add_argument('--cube_dim', type=int, default=4, help="Cube dimension (default: 4x4)")
+    parser_decrypt.add_argument('--engine', type=str, default=AUTO_ENGINE, choices=[AUTO_ENGINE] + available_engines(),
+                               help="Move engine backend (default: auto)")
     parser_decrypt.set_defaults(func=decrypt_message)
 
+    # File subcommands
+    for name, func, help_text in (('encrypt-file', encrypt_file, "Encrypt a file"),
+                                  ('decrypt-file', decrypt_file, "Decrypt a file")):
+        parser_file = subparsers.add_parser(name, help=help_text)
+        parser_file.add_argument('key', type=str, help="Encryption key")
+        parser_file.add_argument('input', type=str, help="Input file path")
+        parser_file.add_argument('output', type=str, help="Output file path")
+        parser_file.add_argument('--cube_dim', type=int, default=4, help="Cube dimension (default: 4x4)")
+        parser_file.add_argument('--engine', type=str, default=AUTO_ENGINE, choices=[AUTO_ENGINE] + available_engines(),
+                                 help="Move engine backend (default: auto)")
+        parser_file.add_argument('--chunk_size', type=int, default=DEFAULT_CHUNK_SIZE,
+                                 help="Pipeline buffer size in bytes (default: 1 MB)")
+        parser_file.set_defaults(func=func)
+
     # Parse arguments and call the appropriate function
     args = parser.parse_args()
     if hasattr(args, 'func'):
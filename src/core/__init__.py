@@ -1,3 +1,4 @@
-from src.core.cipher import CRCrypt
+from src.core.cipher import CRCrypt, CipherSession
 from src.core.cube import RubikCube
-from src.core.steps import Step 
+from src.core.steps import Step
+from src.core.engines import MoveEngine, available_engines, register_engine
@@ -1,37 +1,81 @@
 import os
-from typing import List
+import tempfile
+from typing import Callable, List, Optional
 import numpy as np
 import base64
 from src.core.cube import RubikCube
 from src.core.code import CubeCodeGenerator
 from src.core.steps import Step
+from src.core.engines import AUTO_ENGINE, MoveEngine, get_engine
+from src.core.pipeline import (DEFAULT_BUFFERS, DEFAULT_CHUNK_SIZE, Keystream,
+                               check_pipeline_settings, decrypt_chunk, encrypt_chunk, run_pipeline)
 from src.logging import get_logger
 
 logger = get_logger()
 
+class CipherSession:
+    """A resumable raw-byte encryption or decryption run over one keystream.
+
+    to_bytes() captures the cube state, step index, byte offset, schedule version and a key-derived
+    schedule fingerprint, so another process holding the same key can continue with
+    CRCrypt.session(snapshot) without replaying the schedule. The snapshot determines the rest of
+    the keystream: keep it as secret as the key.
+    """
+
+    def __init__(self, keystream: Keystream):
+        self.keystream = keystream
+
+    @property
+    def offset(self) -> int:
+        return self.keystream.position
+
+    def _process(self, data: bytes, combine: Callable[[np.ndarray, np.ndarray], None]) -> bytes:
+        buffer = np.frombuffer(data, dtype=np.uint8).copy()
+        combine(buffer, self.keystream.read(len(buffer)))
+        return buffer.tobytes()
+
+    def encrypt(self, data: bytes) -> bytes:
+        return self._process(data, encrypt_chunk)
+
+    def decrypt(self, data: bytes) -> bytes:
+        return self._process(data, decrypt_chunk)
+
+    def to_bytes(self) -> bytes:
+        return self.keystream.to_bytes()
+
 class CRCrypt:
     MAX_MESSAGE_LENGTH = 1000000  # 1 MB limit
 
-    def __init__(self, key: str, cube_dim: int = 4):
+    def __init__(self, key: str, cube_dim: int = 4, engine: str | MoveEngine = AUTO_ENGINE):
         if len(key) > self.MAX_MESSAGE_LENGTH:
             raise ValueError(f"Key length exceeds maximum allowed length of {self.MAX_MESSAGE_LENGTH} bytes")
         self.key = key
         self.cube_dim = cube_dim
+        self.engine = engine
         self.code_generator = CubeCodeGenerator(key.encode('utf-8'))
         logger.info(f"Initialized CRCrypt with cube dimension: {cube_dim}")
 
+    def _keystream(self, length: Optional[int] = None) -> Keystream:
+        engine = get_engine(self.engine, self.cube_dim, message_length=length)
+        cube = RubikCube(dimension=self.cube_dim, key=self.key.encode('utf-8'), engine=engine)
+        return Keystream(cube, self.code_generator.key_encode(), CubeCodeGenerator.SCHEDULE_VERSION,
+                         self.code_generator.schedule_fingerprint())
+
+    def session(self, snapshot: Optional[bytes] = None) -> CipherSession:
+        """Start a raw-byte cipher session, or resume one from CipherSession.to_bytes()."""
+        if snapshot is None:
+            return CipherSession(self._keystream())
+        generator = self.code_generator
+        keystream = Keystream.from_buffer(snapshot, generator.key_encode(),
+                                          CubeCodeGenerator.SCHEDULE_VERSION,
+                                          generator.schedule_fingerprint(), engine=self.engine)
+        if keystream.cube.dimension != self.cube_dim:
+            raise ValueError(f"Session cube dimension {keystream.cube.dimension} "
+                             f"does not match {self.cube_dim}")
+        return CipherSession(keystream)
+
     def _generate_keystream(self, length: int) -> List[int]:
-        cube = RubikCube(dimension=self.cube_dim, key=self.key.encode('utf-8'))
-        steps = self.code_generator.key_encode()
-        keystream = []
-        step_index = 0
-        while len(keystream) < length:
-            step = steps[step_index % len(steps)]
-            cube.move(step)
-            face_values = cube.cube[step.face].flatten().astype(int)
-            keystream.extend(face_values)
-            step_index += 1
-        return [x % 256 for x in keystream[:length]]
+        return self._keystream(length).read(length).tolist()
 
     def encrypt(self, message: str) -> str:
         if len(message) > self.MAX_MESSAGE_LENGTH:
@@ -51,4 +95,37 @@ class CRCrypt:
             raise ValueError(f"Ciphertext length exceeds maximum allowed length of {self.MAX_MESSAGE_LENGTH} characters")
         keystream = self._generate_keystream(len(ciphertext_bytes))
         plaintext = ''.join(chr((ord(char) - key_byte) % 256) for char, key_byte in zip(ciphertext_bytes, keystream))
-        return plaintext
\ No newline at end of file
+        return plaintext
+
+    def _process_file(self, src_path: str | os.PathLike, dst_path: str | os.PathLike,
+                      combine: Callable[[np.ndarray, np.ndarray], None], chunk_size: int, buffers: int) -> int:
+        check_pipeline_settings(chunk_size, buffers)
+        if os.path.exists(dst_path) and os.path.samefile(src_path, dst_path):
+            raise ValueError(f"Input and output are the same file: {src_path}")
+        length = os.path.getsize(src_path)
+        keystream = self._keystream(length)
+        # Write next to dst and only replace it once the whole input went through, so a failure
+        # never leaves a truncated output that looks complete.
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(dst_path)),
+                                         prefix=".crcrypt-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as dst, open(src_path, 'rb') as src:
+                written = run_pipeline(src, dst, keystream, combine, chunk_size=chunk_size,
+                                       buffers=buffers, length=length)
+            os.replace(temp_path, dst_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return written
+
+    def encrypt_file(self, src_path: str | os.PathLike, dst_path: str | os.PathLike,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE, buffers: int = DEFAULT_BUFFERS) -> int:
+        """Encrypt a file of any size to raw (not base64) ciphertext, returning the bytes written."""
+        logger.info(f"Encrypting file: {src_path} -> {dst_path}")
+        return self._process_file(src_path, dst_path, encrypt_chunk, chunk_size, buffers)
+
+    def decrypt_file(self, src_path: str | os.PathLike, dst_path: str | os.PathLike,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE, buffers: int = DEFAULT_BUFFERS) -> int:
+        """Decrypt raw ciphertext written by encrypt_file, returning the bytes written."""
+        logger.info(f"Decrypting file: {src_path} -> {dst_path}")
+        return self._process_file(src_path, dst_path, decrypt_chunk, chunk_size, buffers)
@@ -8,12 +8,19 @@ from src.logging import get_logger
 logger = get_logger()
 
 class CubeCodeGenerator:
+    # Bump whenever key_encode() changes, so sessions saved under the old schedule are rejected.
+    SCHEDULE_VERSION = 1
+
     def __init__(self, key: bytes):
         self.key = key
         self.hash = hashlib.sha256(key).digest()
         self.seed = int.from_bytes(self.hash[:4], byteorder='big')  # Use first 4 bytes for seed
         logger.info(f"Initialized CubeCodeGenerator with key hash: {self.hash.hex()}")
 
+    def schedule_fingerprint(self) -> bytes:
+        # Domain-separated and truncated so it identifies the schedule without exposing the seed.
+        return hashlib.sha256(b"CRCrypt schedule fingerprint" + self.hash).digest()[:8]
+
     def key_encode(self) -> List[Step]:
         np.random.seed(self.seed)
         steps = []
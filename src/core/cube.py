@@ -1,17 +1,25 @@
 import numpy as np
 import hashlib
+import struct
 from typing import List
-from src.core.steps import Step, apply_step, apply_steps, cube_state_str
+from src.core.steps import Step, cube_state_str
+from src.core.engines import MoveEngine, REFERENCE_ENGINE, get_engine
 from src.logging import get_logger
 
 logger = get_logger()
 
+# to_bytes() layout: magic, format version, dimension, then the raw uint8 state in face order.
+STATE_MAGIC = b"CRCB"
+STATE_VERSION = 1
+_STATE_HEADER = struct.Struct("<4sBH")
+
 class RubikCube:
-    def __init__(self, dimension: int = 3, key: bytes = None):
+    def __init__(self, dimension: int = 3, key: bytes = None, engine: str | MoveEngine = REFERENCE_ENGINE):
         if dimension < 2:
             raise ValueError("Cube dimension must be at least 2")
         
         self.dimension = dimension
+        self.engine = get_engine(engine, dimension)
         self.cube = np.zeros((6, dimension, dimension), dtype=np.uint8)
         
         if key is not None:
@@ -29,13 +37,51 @@ class RubikCube:
         logger.info(f"Initialized {dimension}x{dimension} Rubik's Cube")
         logger.debug(f"Initial cube state:\n{cube_state_str(self.cube)}")
 
+    @classmethod
+    def from_buffer(cls, buffer, engine: str | MoveEngine = REFERENCE_ENGINE) -> "RubikCube":
+        """Restore a cube from to_bytes() output without copying the state.
+
+        The restored state is a read-only view of the buffer, copied on the first move, so moves
+        never write back into the caller's buffer whichever engine is used.
+        """
+        view = memoryview(buffer).cast('B').toreadonly()
+        if len(view) < _STATE_HEADER.size:
+            raise ValueError("Buffer too short for cube state header")
+        magic, version, dimension = _STATE_HEADER.unpack_from(view)
+        if magic != STATE_MAGIC:
+            raise ValueError("Buffer does not contain a serialized RubikCube")
+        if version != STATE_VERSION:
+            raise ValueError(f"Unsupported cube state version: {version}")
+        if dimension < 2:
+            raise ValueError("Cube dimension must be at least 2")
+        size = 6 * dimension * dimension
+        if len(view) < _STATE_HEADER.size + size:
+            raise ValueError(f"Buffer too short for {dimension}x{dimension} cube state")
+        cube = cls.__new__(cls)
+        cube.dimension = dimension
+        cube.engine = get_engine(engine, dimension)
+        cube.cube = np.frombuffer(view, dtype=np.uint8, count=size,
+                                  offset=_STATE_HEADER.size).reshape(6, dimension, dimension)
+        logger.info(f"Restored {dimension}x{dimension} Rubik's Cube from buffer")
+        return cube
+
+    def to_bytes(self) -> bytes:
+        return _STATE_HEADER.pack(STATE_MAGIC, STATE_VERSION, self.dimension) + self.cube.tobytes()
+
+    def _ensure_writeable(self) -> None:
+        # States restored by from_buffer() are shared with the buffer until the first move.
+        if not self.cube.flags.writeable:
+            self.cube = self.cube.copy()
+
     def move(self, step: Step) -> None:
         logger.debug(f"Performing move: {step}")
-        self.cube = apply_step(self.cube, step)
+        self._ensure_writeable()
+        self.cube = self.engine.apply_step(self.cube, step)
 
     def moves(self, steps: List[Step]) -> None:
         logger.info(f"Performing {len(steps)} moves")
-        self.cube = apply_steps(self.cube, steps)
+        self._ensure_writeable()
+        self.cube = self.engine.apply_steps(self.cube, steps)
 
     def is_solved(self) -> bool:
         logger.debug("Checking if cube is solved")
@@ -0,0 +1,175 @@
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Type
+import numpy as np
+from src.core.steps import Step, apply_step, get_adjacent_faces
+from src.logging import get_logger
+
+logger = get_logger()
+
+AUTO_ENGINE = "auto"
+REFERENCE_ENGINE = "reference"
+
+# Below this many steps the keystream is too short for a faster engine to pay back the
+# calibration run, so "auto" reuses an earlier calibration or falls back to the direct engine.
+AUTO_MIN_STEPS = 64
+AUTO_FALLBACK_ENGINE = "direct"
+CALIBRATION_ROUNDS = 3
+
+class MoveEngine:
+    """Backend that applies Steps to a (6, dim, dim) cube array."""
+
+    name: str = ""
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+
+    def apply_step(self, cube: np.ndarray, step: Step) -> np.ndarray:
+        raise NotImplementedError
+
+    def apply_steps(self, cube: np.ndarray, steps: List[Step]) -> np.ndarray:
+        for step in steps:
+            cube = self.apply_step(cube, step)
+        return cube
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(dimension={self.dimension})"
+
+ENGINES: Dict[str, Type[MoveEngine]] = {}
+_calibration: Dict[int, Dict[str, float]] = {}
+
+def register_engine(engine_cls: Type[MoveEngine]) -> Type[MoveEngine]:
+    if not engine_cls.name or engine_cls.name == AUTO_ENGINE:
+        raise ValueError(f"Invalid engine name: {engine_cls.name!r}")
+    if engine_cls.name in ENGINES:
+        raise ValueError(f"Engine already registered: {engine_cls.name}")
+    ENGINES[engine_cls.name] = engine_cls
+    _calibration.clear()  # earlier timings do not include the new engine
+    logger.debug(f"Registered move engine: {engine_cls.name}")
+    return engine_cls
+
+def unregister_engine(name: str) -> None:
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine: {name!r}")
+    del ENGINES[name]
+    _calibration.clear()  # cached timings may name the removed engine
+    logger.debug(f"Unregistered move engine: {name}")
+
+def available_engines() -> List[str]:
+    return list(ENGINES)
+
+@register_engine
+class ReferenceEngine(MoveEngine):
+    """The original step implementation from src.core.steps, used as ground truth."""
+
+    name = REFERENCE_ENGINE
+
+    def apply_step(self, cube: np.ndarray, step: Step) -> np.ndarray:
+        return apply_step(cube, step)
+
+@register_engine
+class DirectEngine(MoveEngine):
+    """Same slice operations as the reference engine, without per-move state dumps."""
+
+    name = "direct"
+
+    def apply_step(self, cube: np.ndarray, step: Step) -> np.ndarray:
+        adjacent_faces = get_adjacent_faces(step.face)
+        for _ in range(step.rotations):
+            cube[step.face] = np.rot90(cube[step.face], k=-step.direction)
+            if step.direction == 1:
+                temp = cube[adjacent_faces[3][0]][adjacent_faces[3][1]].copy()
+                for i in range(3, 0, -1):
+                    src_face, src_slice = adjacent_faces[i-1]
+                    dst_face, dst_slice = adjacent_faces[i]
+                    cube[dst_face][dst_slice] = cube[src_face][src_slice]
+                cube[adjacent_faces[0][0]][adjacent_faces[0][1]] = temp
+            else:
+                temp = cube[adjacent_faces[0][0]][adjacent_faces[0][1]].copy()
+                for i in range(3):
+                    src_face, src_slice = adjacent_faces[i+1]
+                    dst_face, dst_slice = adjacent_faces[i]
+                    cube[dst_face][dst_slice] = cube[src_face][src_slice]
+                cube[adjacent_faces[3][0]][adjacent_faces[3][1]] = temp
+        return cube
+
+@lru_cache(maxsize=None)
+def _single_turn_permutation(dimension: int, face: int, direction: int) -> np.ndarray:
+    # Every move only relocates stickers, so running the reference step on a cube of
+    # sticker indices yields the gather index for that move.
+    indices = np.arange(6 * dimension * dimension, dtype=np.intp).reshape(6, dimension, dimension)
+    return apply_step(indices, Step(face, direction, 1)).reshape(-1).copy()
+
+@lru_cache(maxsize=None)
+def step_permutation(dimension: int, face: int, direction: int, rotations: int) -> np.ndarray:
+    turn = _single_turn_permutation(dimension, face, direction)
+    permutation = np.arange(turn.size, dtype=np.intp)
+    # Four quarter turns are the identity for both the face and its adjacent strips.
+    for _ in range(max(rotations, 0) % 4):
+        permutation = permutation[turn]
+    permutation.flags.writeable = False
+    return permutation
+
+@register_engine
+class PermutationEngine(MoveEngine):
+    """Applies each step as a single precomputed gather over the flattened cube."""
+
+    name = "permutation"
+
+    def apply_step(self, cube: np.ndarray, step: Step) -> np.ndarray:
+        permutation = step_permutation(self.dimension, step.face, step.direction, step.rotations)
+        return cube.reshape(-1)[permutation].reshape(cube.shape)
+
+def _calibration_steps() -> List[Step]:
+    return [Step(face, direction, rotations)
+            for face in range(6) for direction in (1, -1) for rotations in (1, 2, 3)]
+
+def calibrate(dimension: int) -> Dict[str, float]:
+    """Measure the per-step cost of every registered engine for a cube dimension.
+
+    Engines that raise are logged and left out of the result.
+    """
+    if dimension in _calibration:
+        return _calibration[dimension]
+    steps = _calibration_steps()
+    start_state = np.random.default_rng(dimension).integers(
+        0, 256, (6, dimension, dimension), dtype=np.uint8)
+    timings = {}
+    for name, engine_cls in ENGINES.items():
+        try:
+            engine = engine_cls(dimension)
+            engine.apply_steps(start_state.copy(), steps)  # warm up caches and lookup tables
+            best = float("inf")
+            for _ in range(CALIBRATION_ROUNDS):
+                cube = start_state.copy()
+                started = time.perf_counter()
+                engine.apply_steps(cube, steps)
+                best = min(best, time.perf_counter() - started)
+        except Exception as e:
+            logger.warning(f"Skipping {name} move engine for dimension {dimension}: {e!r}")
+            continue
+        timings[name] = best / len(steps)
+    logger.info(f"Calibrated move engines for dimension {dimension}: {timings}")
+    _calibration[dimension] = timings
+    return timings
+
+def select_engine(dimension: int, message_length: Optional[int] = None) -> str:
+    """Pick the engine name "auto" resolves to for this cube dimension and message length."""
+    if message_length is not None and dimension not in _calibration:
+        steps_needed = -(-message_length // (dimension * dimension))
+        if steps_needed < AUTO_MIN_STEPS:
+            return AUTO_FALLBACK_ENGINE
+    timings = calibrate(dimension)
+    return min(timings, key=timings.get)
+
+def get_engine(engine: str | MoveEngine, dimension: int, message_length: Optional[int] = None) -> MoveEngine:
+    if isinstance(engine, MoveEngine):
+        if engine.dimension != dimension:
+            raise ValueError(f"Engine dimension {engine.dimension} does not match cube dimension {dimension}")
+        return engine
+    if engine == AUTO_ENGINE:
+        engine = select_engine(dimension, message_length)
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine!r}. Available engines: {available_engines()}")
+    logger.info(f"Using {engine} move engine for dimension {dimension}")
+    return ENGINES[engine](dimension)
@@ -0,0 +1,229 @@
+import queue
+import struct
+import threading
+from typing import BinaryIO, Callable, List, Optional
+import numpy as np
+from src.core.cube import RubikCube
+from src.core.engines import MoveEngine, REFERENCE_ENGINE
+from src.core.steps import Step
+from src.logging import get_logger
+
+logger = get_logger()
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MB per buffer
+DEFAULT_BUFFERS = 4
+
+# to_bytes() layout: magic, format version, schedule version, schedule fingerprint, step index,
+# byte offset, then the RubikCube.to_bytes() state.
+SESSION_MAGIC = b"CRCS"
+SESSION_VERSION = 1
+_SESSION_HEADER = struct.Struct("<4sBH8sQQ")
+NO_FINGERPRINT = bytes(8)
+
+class Keystream:
+    """Incremental keystream: the face values of the cube after each step of the schedule."""
+
+    def __init__(self, cube: RubikCube, steps: List[Step], schedule_version: int = 0,
+                 fingerprint: bytes = NO_FINGERPRINT):
+        self.cube = cube
+        self.steps = steps
+        self.schedule_version = schedule_version
+        self.fingerprint = fingerprint
+        self.step_index = 0
+        self.position = 0
+
+    @classmethod
+    def from_buffer(cls, buffer, steps: List[Step], schedule_version: int = 0,
+                    fingerprint: bytes = NO_FINGERPRINT,
+                    engine: str | MoveEngine = REFERENCE_ENGINE) -> "Keystream":
+        """Resume a keystream saved with to_bytes(), sharing the cube state until the first move."""
+        view = memoryview(buffer).cast('B')
+        if len(view) < _SESSION_HEADER.size:
+            raise ValueError("Buffer too short for session header")
+        magic, version, saved_schedule, saved_fingerprint, step_index, position = \
+            _SESSION_HEADER.unpack_from(view)
+        if magic != SESSION_MAGIC:
+            raise ValueError("Buffer does not contain a serialized cipher session")
+        if version != SESSION_VERSION:
+            raise ValueError(f"Unsupported session version: {version}")
+        if saved_schedule != schedule_version:
+            raise ValueError(f"Session uses schedule version {saved_schedule}, "
+                             f"expected {schedule_version}")
+        if saved_fingerprint != fingerprint:
+            raise ValueError("Session was created with a different key schedule")
+        cube = RubikCube.from_buffer(view[_SESSION_HEADER.size:], engine=engine)
+        face_size = cube.dimension * cube.dimension
+        consistent = (step_index == 0 and position == 0) or \
+            (step_index - 1) * face_size < position <= step_index * face_size
+        if not consistent:
+            raise ValueError(f"Inconsistent session: offset {position} at step {step_index}")
+        keystream = cls(cube, steps, schedule_version, fingerprint)
+        keystream.step_index = step_index
+        keystream.position = position
+        logger.info(f"Resumed keystream at step {step_index}, offset {position}")
+        return keystream
+
+    def to_bytes(self) -> bytes:
+        header = _SESSION_HEADER.pack(SESSION_MAGIC, SESSION_VERSION, self.schedule_version,
+                                      self.fingerprint, self.step_index, self.position)
+        return header + self.cube.to_bytes()
+
+    def fill(self, out: np.ndarray) -> None:
+        face_size = self.cube.dimension * self.cube.dimension
+        needed = len(out)
+        written = 0
+        # Bytes of the last step's face that an earlier fill did not consume.
+        pending = self.step_index * face_size - self.position
+        if pending and needed:
+            step = self.steps[(self.step_index - 1) % len(self.steps)]
+            face = self.cube.cube[step.face].reshape(-1)
+            take = min(pending, needed)
+            out[:take] = face[face_size - pending:face_size - pending + take]
+            written = take
+        while written < needed:
+            step = self.steps[self.step_index % len(self.steps)]
+            self.cube.move(step)
+            self.step_index += 1
+            take = min(face_size, needed - written)
+            out[written:written + take] = self.cube.cube[step.face].reshape(-1)[:take]
+            written += take
+        self.position += needed
+
+    def read(self, length: int) -> np.ndarray:
+        out = np.empty(length, dtype=np.uint8)
+        self.fill(out)
+        return out
+
+def encrypt_chunk(data: np.ndarray, keystream: np.ndarray) -> None:
+    np.add(data, keystream, out=data)  # uint8 arithmetic wraps mod 256
+
+def decrypt_chunk(data: np.ndarray, keystream: np.ndarray) -> None:
+    np.subtract(data, keystream, out=data)
+
+_DONE = None
+
+def check_pipeline_settings(chunk_size: int, buffers: int) -> None:
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    if buffers < 2:
+        raise ValueError("Pipeline needs at least 2 buffers")
+
+def run_pipeline(src: BinaryIO, dst: BinaryIO, keystream: Keystream,
+                 combine: Callable[[np.ndarray, np.ndarray], None],
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, buffers: int = DEFAULT_BUFFERS,
+                 length: Optional[int] = None) -> int:
+    """Stream src through the cipher into dst, overlapping reads, keystream generation and writes.
+
+    A reader thread fills data buffers from src and a producer thread fills keystream buffers
+    ahead of time, while the calling thread combines the two in place and hands the result to a
+    writer thread. All buffers are allocated once and recycled through queues. When length is
+    known the producer stops exactly there instead of running ahead of the end of the input.
+    Returns the number of bytes written.
+    """
+    check_pipeline_settings(chunk_size, buffers)
+
+    data_buffers = [np.empty(chunk_size, dtype=np.uint8) for _ in range(buffers)]
+    key_buffers = [np.empty(chunk_size, dtype=np.uint8) for _ in range(buffers)]
+    free_data: queue.Queue = queue.Queue()
+    free_keys: queue.Queue = queue.Queue()
+    read_data: queue.Queue = queue.Queue()
+    ready_keys: queue.Queue = queue.Queue()
+    to_write: queue.Queue = queue.Queue()
+    for index in range(buffers):
+        free_data.put(index)
+        free_keys.put(index)
+
+    stop = threading.Event()
+    errors: List[BaseException] = []
+
+    def guarded(target: Callable[[], None], on_error: Callable[[], None]) -> Callable[[], None]:
+        def run() -> None:
+            try:
+                target()
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+                on_error()
+        return run
+
+    def reader() -> None:
+        while not stop.is_set():
+            index = free_data.get()
+            if index is _DONE:
+                break
+            # Fill whole buffers so data chunks line up with keystream chunks.
+            view = memoryview(data_buffers[index])
+            count = 0
+            while count < chunk_size:
+                received = src.readinto(view[count:])
+                if not received:
+                    break
+                count += received
+            if not count:
+                break
+            read_data.put((index, count))
+            if count < chunk_size:
+                break
+        read_data.put(_DONE)
+
+    def producer() -> None:
+        remaining = length
+        while not stop.is_set() and remaining != 0:
+            index = free_keys.get()
+            if index is _DONE:
+                break
+            count = chunk_size if remaining is None else min(chunk_size, remaining)
+            keystream.fill(key_buffers[index][:count])
+            if remaining is not None:
+                remaining -= count
+            ready_keys.put((index, count))
+        ready_keys.put(_DONE)
+
+    def writer() -> None:
+        while True:
+            item = to_write.get()
+            if item is _DONE:
+                break
+            index, count = item
+            if not errors:
+                dst.write(memoryview(data_buffers[index])[:count])
+            free_data.put(index)
+
+    threads = [
+        threading.Thread(target=guarded(reader, lambda: read_data.put(_DONE)), name="crcrypt-reader"),
+        threading.Thread(target=guarded(producer, lambda: ready_keys.put(_DONE)), name="crcrypt-keystream"),
+        threading.Thread(target=guarded(writer, lambda: free_data.put(_DONE)), name="crcrypt-writer"),
+    ]
+    for thread in threads:
+        thread.start()
+
+    total = 0
+    try:
+        while not stop.is_set():
+            item = read_data.get()
+            if item is _DONE:
+                if length is not None and total < length and not errors:
+                    raise ValueError(f"Input ended after {total} of the expected {length} bytes")
+                break
+            index, count = item
+            key_item = ready_keys.get()
+            if key_item is _DONE and errors:
+                break
+            if key_item is _DONE or key_item[1] < count:
+                raise ValueError(f"Input is longer than the expected {length} bytes")
+            key_index = key_item[0]
+            combine(data_buffers[index][:count], key_buffers[key_index][:count])
+            free_keys.put(key_index)
+            to_write.put((index, count))
+            total += count
+    finally:
+        stop.set()
+        free_data.put(_DONE)
+        free_keys.put(_DONE)
+        to_write.put(_DONE)
+        for thread in threads:
+            thread.join()
+    if errors:
+        raise errors[0]
+    logger.info(f"Pipeline processed {total} bytes in {chunk_size}-byte chunks over {buffers} buffers")
+    return total
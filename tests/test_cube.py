@@ -65,5 +65,43 @@ class TestRubikCube(unittest.TestCase):
                 cube.move(Step(0, 1, 1))
             self.assertTrue(np.array_equal(cube.cube, initial_state))
 
+    def test_serialization_roundtrip(self):
+        for dim in [2, 3, 4, 5, 10]:
+            cube = RubikCube(dimension=dim, key=b"serialize")
+            cube.move(Step(2, -1, 3))
+            data = cube.to_bytes()
+            restored = RubikCube.from_buffer(data)
+            self.assertEqual(restored.dimension, dim)
+            self.assertTrue(np.array_equal(restored.cube, cube.cube))
+            self.assertEqual(restored.to_bytes(), data)
+
+    def test_from_buffer_is_zero_copy(self):
+        data = bytearray(RubikCube(dimension=3, key=b"view").to_bytes())
+        restored = RubikCube.from_buffer(data)
+        self.assertTrue(np.shares_memory(restored.cube, np.frombuffer(data, dtype=np.uint8)))
+
+    def test_moves_never_write_to_buffer(self):
+        for engine in ["reference", "direct", "permutation"]:
+            data = bytearray(RubikCube(dimension=3).to_bytes())
+            original = bytes(data)
+            restored = RubikCube.from_buffer(data, engine=engine)
+            restored.move(Step(0, 1, 1))
+            self.assertFalse(restored.is_solved())
+            self.assertEqual(bytes(data), original)
+
+    def test_from_read_only_buffer_moves(self):
+        data = RubikCube(dimension=3).to_bytes()
+        restored = RubikCube.from_buffer(data)
+        self.assertFalse(restored.cube.flags.writeable)
+        restored.move(Step(0, 1, 1))
+        self.assertFalse(restored.is_solved())
+        self.assertTrue(RubikCube.from_buffer(data).is_solved())
+
+    def test_from_invalid_buffer(self):
+        data = RubikCube(dimension=3).to_bytes()
+        for invalid in (b"", b"XXXX" + data[4:], data[:-1]):
+            with self.assertRaises(ValueError):
+                RubikCube.from_buffer(invalid)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,122 @@
+import unittest
+import numpy as np
+from src.core import CRCrypt, RubikCube, Step
+from src.core.code import CubeCodeGenerator
+from src.core.engines import (MoveEngine, ReferenceEngine, available_engines, calibrate, get_engine,
+                              register_engine, select_engine, unregister_engine,
+                              AUTO_FALLBACK_ENGINE, AUTO_MIN_STEPS, ENGINES)
+
+class TestEngines(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(2024)
+
+    def random_key(self) -> str:
+        return self.rng.integers(0, 256, int(self.rng.integers(1, 33)), dtype=np.uint8).tobytes().hex()
+
+    def test_engines_match_reference_moves(self):
+        for _ in range(20):
+            dim = int(self.rng.integers(2, 9))
+            key = self.random_key().encode('utf-8')
+            steps = CubeCodeGenerator(key).key_encode()
+            reference = RubikCube(dimension=dim, key=key, engine="reference")
+            reference.moves(steps)
+            for name in available_engines():
+                cube = RubikCube(dimension=dim, key=key, engine=name)
+                cube.moves(steps)
+                self.assertTrue(np.array_equal(cube.cube, reference.cube), f"{name} differs for dim {dim}")
+                self.assertEqual(cube.cube.dtype, reference.cube.dtype)
+
+    def test_engines_match_reference_keystream(self):
+        for _ in range(10):
+            dim = int(self.rng.integers(2, 7))
+            length = int(self.rng.integers(0, 3000))
+            key = self.random_key()
+            expected = CRCrypt(key, cube_dim=dim, engine="reference")._generate_keystream(length)
+            for name in available_engines() + ["auto"]:
+                keystream = CRCrypt(key, cube_dim=dim, engine=name)._generate_keystream(length)
+                self.assertEqual(keystream, expected, f"{name} differs for dim {dim}, length {length}")
+
+    def test_unusual_steps_match_reference(self):
+        steps = [Step(face, direction, rotations)
+                 for face in range(6) for direction in (1, -1, 2) for rotations in (0, 1, 4, 5)]
+        for dim in (2, 3, 5):
+            for step in steps:
+                expected = RubikCube(dimension=dim, key=b"edge", engine="reference")
+                expected.move(step)
+                for name in available_engines():
+                    cube = RubikCube(dimension=dim, key=b"edge", engine=name)
+                    cube.move(step)
+                    self.assertTrue(np.array_equal(cube.cube, expected.cube), f"{name} differs for {step}")
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            RubikCube(dimension=3, engine="missing")
+
+    def test_engine_dimension_mismatch(self):
+        with self.assertRaises(ValueError):
+            RubikCube(dimension=3, engine=get_engine("permutation", 4))
+
+    def test_duplicate_registration(self):
+        with self.assertRaises(ValueError):
+            register_engine(ReferenceEngine)
+
+    def test_unregister_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            unregister_engine("missing")
+
+    def test_auto_selection(self):
+        # Short inputs skip calibration until the dimension has been calibrated.
+        self.assertEqual(select_engine(11, message_length=121), AUTO_FALLBACK_ENGINE)
+        winner = select_engine(11, message_length=121 * AUTO_MIN_STEPS)
+        self.assertIn(winner, ENGINES)
+        self.assertEqual(select_engine(11, message_length=121), winner)
+
+    def test_custom_engine(self):
+        class DoubleEngine(MoveEngine):
+            name = "test-double"
+
+            def apply_step(self, cube, step):
+                return ReferenceEngine(self.dimension).apply_step(cube, step)
+
+        register_engine(DoubleEngine)
+        try:
+            cube = RubikCube(dimension=3, engine="test-double")
+            cube.move(Step(0, 1, 1))
+            self.assertFalse(cube.is_solved())
+        finally:
+            unregister_engine("test-double")
+
+    def test_engine_registered_after_calibration(self):
+        class LateEngine(MoveEngine):
+            name = "test-late"
+
+            def apply_step(self, cube, step):
+                return cube
+
+        select_engine(4)
+        register_engine(LateEngine)
+        try:
+            self.assertIn("test-late", calibrate(4))
+            self.assertEqual(select_engine(4), "test-late")
+        finally:
+            unregister_engine("test-late")
+
+    def test_failing_engine_is_skipped(self):
+        class BrokenEngine(MoveEngine):
+            name = "test-broken"
+
+            def apply_step(self, cube, step):
+                raise RuntimeError("broken backend")
+
+        register_engine(BrokenEngine)
+        try:
+            self.assertNotIn("test-broken", calibrate(4))
+            self.assertNotEqual(select_engine(4), "test-broken")
+            message = "Calibration survives a broken engine. " * 10
+            crcrypt = CRCrypt("key", engine="auto")
+            self.assertEqual(crcrypt.decrypt(crcrypt.encrypt(message)), message)
+        finally:
+            unregister_engine("test-broken")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import base64
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from src.core import CRCrypt
+from src.core.pipeline import encrypt_chunk, run_pipeline
+
+class FailingWriter(io.RawIOBase):
+    def writable(self):
+        return True
+
+    def write(self, data):
+        raise OSError("disk full")
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.crcrypt = CRCrypt("pipeline_key", cube_dim=3)
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.tempdir.name, name)
+
+    def write_file(self, name: str, data: bytes) -> str:
+        path = self.path(name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def read_file(self, path: str) -> bytes:
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def test_keystream_chunking_is_seamless(self):
+        expected = self.crcrypt._generate_keystream(1000)
+        keystream = self.crcrypt._keystream(1000)
+        pieces = [keystream.read(size) for size in (1, 8, 9, 0, 13, 100, 869)]
+        self.assertEqual(np.concatenate(pieces).tolist(), expected)
+
+    def test_file_roundtrip(self):
+        data = np.random.default_rng(7).integers(0, 256, 50000, dtype=np.uint8).tobytes()
+        src = self.write_file("plain.bin", data)
+        for chunk_size, buffers in ((1 << 20, 4), (4096, 2), (1000, 3), (7, 5)):
+            encrypted, decrypted = self.path("enc.bin"), self.path("dec.bin")
+            self.assertEqual(self.crcrypt.encrypt_file(src, encrypted, chunk_size, buffers), len(data))
+            self.assertNotEqual(self.read_file(encrypted), data)
+            self.crcrypt.decrypt_file(encrypted, decrypted, chunk_size, buffers)
+            self.assertEqual(self.read_file(decrypted), data)
+
+    def test_file_matches_string_mode(self):
+        message = "Streaming and in-memory encryption share one keystream. " * 50
+        src = self.write_file("plain.txt", message.encode('latin-1'))
+        encrypted = self.path("enc.bin")
+        self.crcrypt.encrypt_file(src, encrypted, chunk_size=100)
+        self.assertEqual(self.read_file(encrypted), base64.b64decode(self.crcrypt.encrypt(message)))
+
+    def test_empty_file(self):
+        src = self.write_file("empty.bin", b"")
+        encrypted = self.path("enc.bin")
+        self.assertEqual(self.crcrypt.encrypt_file(src, encrypted), 0)
+        self.assertEqual(self.read_file(encrypted), b"")
+
+    def test_same_input_and_output(self):
+        data = b"do not truncate me" * 100
+        path = self.write_file("plain.bin", data)
+        with self.assertRaises(ValueError):
+            self.crcrypt.encrypt_file(path, path)
+        self.assertEqual(self.read_file(path), data)
+
+    def test_invalid_settings_leave_output_untouched(self):
+        src = self.write_file("plain.bin", b"data")
+        dst = self.write_file("existing.bin", b"keep")
+        with self.assertRaises(ValueError):
+            self.crcrypt.encrypt_file(src, dst, chunk_size=0)
+        self.assertEqual(self.read_file(dst), b"keep")
+
+    def test_failure_leaves_no_partial_output(self):
+        src = self.write_file("plain.bin", b"x" * 5000)
+        dst = self.write_file("existing.bin", b"keep")
+        # The file reports fewer bytes than are actually read, so the pipeline fails midway.
+        with mock.patch("src.core.cipher.os.path.getsize", return_value=1000):
+            with self.assertRaises(ValueError):
+                self.crcrypt.encrypt_file(src, dst, chunk_size=100)
+        self.assertEqual(self.read_file(dst), b"keep")
+        self.assertEqual(sorted(os.listdir(self.tempdir.name)), ["existing.bin", "plain.bin"])
+
+    def test_writer_error_propagates(self):
+        src = io.BytesIO(b"x" * 10000)
+        with self.assertRaises(OSError):
+            run_pipeline(src, FailingWriter(), self.crcrypt._keystream(), encrypt_chunk, chunk_size=100, buffers=2)
+
+    def test_input_longer_than_length(self):
+        with self.assertRaises(ValueError):
+            run_pipeline(io.BytesIO(b"x" * 500), io.BytesIO(), self.crcrypt._keystream(), encrypt_chunk,
+                         chunk_size=100, length=300)
+
+    def test_input_shorter_than_length(self):
+        with self.assertRaises(ValueError):
+            run_pipeline(io.BytesIO(b"x" * 250), io.BytesIO(), self.crcrypt._keystream(), encrypt_chunk,
+                         chunk_size=100, length=300)
+
+    def test_file_shrinking_is_an_error(self):
+        src = self.write_file("plain.bin", b"x" * 500)
+        dst = self.path("enc.bin")
+        with mock.patch("src.core.cipher.os.path.getsize", return_value=800):
+            with self.assertRaises(ValueError):
+                self.crcrypt.encrypt_file(src, dst, chunk_size=100)
+        self.assertFalse(os.path.exists(dst))
+
+    def test_invalid_pipeline_settings(self):
+        with self.assertRaises(ValueError):
+            run_pipeline(io.BytesIO(), io.BytesIO(), self.crcrypt._keystream(), encrypt_chunk, chunk_size=0)
+        with self.assertRaises(ValueError):
+            run_pipeline(io.BytesIO(), io.BytesIO(), self.crcrypt._keystream(), encrypt_chunk, buffers=1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import base64
+import unittest
+import numpy as np
+from src.core import CRCrypt
+from src.core.code import CubeCodeGenerator
+from src.core.pipeline import Keystream
+
+class TestSession(unittest.TestCase):
+    def setUp(self):
+        self.crcrypt = CRCrypt("session_key", cube_dim=3)
+        self.data = np.random.default_rng(11).integers(0, 256, 5000, dtype=np.uint8).tobytes()
+
+    def test_session_matches_string_mode(self):
+        message = "Sessions use the same keystream as encrypt()."
+        encrypted = self.crcrypt.session().encrypt(message.encode('latin-1'))
+        self.assertEqual(self.crcrypt.decrypt(base64.b64encode(encrypted).decode('ascii')), message)
+
+    def test_resume_at_any_offset(self):
+        expected = self.crcrypt.session().encrypt(self.data)
+        for split in (0, 1, 8, 9, 10, 1234, len(self.data)):
+            first = self.crcrypt.session()
+            head = first.encrypt(self.data[:split])
+            snapshot = first.to_bytes()
+            resumed = CRCrypt("session_key", cube_dim=3, engine="permutation").session(snapshot)
+            self.assertEqual(resumed.offset, split)
+            self.assertEqual(head + resumed.encrypt(self.data[split:]), expected)
+
+    def test_resume_decryption(self):
+        ciphertext = self.crcrypt.session().encrypt(self.data)
+        session = self.crcrypt.session()
+        head = session.decrypt(ciphertext[:777])
+        resumed = self.crcrypt.session(bytearray(session.to_bytes()))
+        self.assertEqual(head + resumed.decrypt(ciphertext[777:]), self.data)
+
+    def test_snapshot_is_not_changed_by_resumed_session(self):
+        session = self.crcrypt.session()
+        session.encrypt(self.data[:100])
+        snapshot = session.to_bytes()
+        self.crcrypt.session(snapshot).encrypt(self.data[100:])
+        self.assertEqual(self.crcrypt.session(snapshot).offset, 100)
+        self.assertEqual(snapshot, session.to_bytes())
+
+    def test_resume_twice_from_writable_buffer(self):
+        expected = self.crcrypt.session().encrypt(self.data)
+        session = self.crcrypt.session()
+        head = session.encrypt(self.data[:100])
+        snapshot = bytearray(session.to_bytes())
+        original = bytes(snapshot)
+        crcrypt = CRCrypt("session_key", cube_dim=3, engine="direct")
+        for _ in range(2):
+            self.assertEqual(head + crcrypt.session(snapshot).encrypt(self.data[100:]), expected)
+            self.assertEqual(bytes(snapshot), original)
+
+    def test_schedule_version_mismatch(self):
+        snapshot = self.crcrypt.session().to_bytes()
+        generator = self.crcrypt.code_generator
+        with self.assertRaises(ValueError):
+            Keystream.from_buffer(snapshot, generator.key_encode(),
+                                  CubeCodeGenerator.SCHEDULE_VERSION + 1,
+                                  generator.schedule_fingerprint())
+
+    def test_key_mismatch(self):
+        session = self.crcrypt.session()
+        session.encrypt(self.data[:100])
+        with self.assertRaises(ValueError):
+            CRCrypt("other_key", cube_dim=3).session(session.to_bytes())
+
+    def test_dimension_mismatch(self):
+        snapshot = self.crcrypt.session().to_bytes()
+        with self.assertRaises(ValueError):
+            CRCrypt("session_key", cube_dim=4).session(snapshot)
+
+    def test_invalid_snapshot(self):
+        snapshot = bytearray(self.crcrypt.session().to_bytes())
+        snapshot[0:4] = b"XXXX"
+        with self.assertRaises(ValueError):
+            self.crcrypt.session(snapshot)
+        with self.assertRaises(ValueError):
+            self.crcrypt.session(b"")
+
+if __name__ == '__main__':
+    unittest.main()